@@ -0,0 +1,94 @@
+import csv
+import sys
+
+import numpy as np
+
+from core import Measures, measures
+
+# Transitions for the Esteban & Ray axioms animations
+# Each animation is modelled here as an array of bin frequencies
+# Each array is a 'snapshot' of the whole animation
+ANIMATIONS = [
+    [ [ 10, 0, 0, 0, 5, 0, 0, 0, 5, 0 ],
+      [ 10, 0, 0, 0, 4, 1, 0, 1, 4, 0 ],
+      [ 10, 0, 0, 0, 3, 1, 2, 1, 3, 0 ],
+      [ 10, 0, 0, 0, 2, 1, 4, 1, 2, 0 ],
+      [ 10, 0, 0, 0, 1, 1, 6, 1, 1, 0 ],
+      [ 10, 0, 0, 0, 0, 1, 8, 1, 0, 0 ],
+      [ 10, 0, 0, 0, 0, 0, 10, 0, 0, 0 ] ],
+    [ [ 10, 0, 0, 0, 0, 3, 0, 0, 0, 6 ],
+      [ 10, 0, 0, 0, 0, 2, 1, 0, 0, 6 ],
+      [ 10, 0, 0, 0, 0, 1, 1, 1, 0, 6 ],
+      [ 10, 0, 0, 0, 0, 0, 1, 2, 0, 6 ],
+      [ 10, 0, 0, 0, 0, 0, 0, 3, 0, 6 ] ],
+    [ [ 6, 0, 0, 0, 0, 8, 0, 0, 0, 6 ],
+      [ 6, 0, 0, 0, 1, 6, 1, 0, 0, 6 ],
+      [ 6, 0, 0, 1, 1, 4, 1, 1, 0, 6 ],
+      [ 6, 0, 1, 1, 1, 2, 1, 1, 1, 6 ],
+      [ 6, 1, 1, 1, 1, 0, 1, 1, 1, 7 ],
+      [ 7, 1, 1, 1, 0, 0, 0, 1, 1, 8 ],
+      [ 8, 1, 1, 0, 0, 0, 0, 0, 1, 9 ],
+      [ 9, 1, 0, 0, 0, 0, 0, 0, 0, 10 ],
+      [ 10, 0, 0, 0, 0, 0, 0, 0, 0, 10 ], ]
+]
+
+# Statistics computed for every frame, in column order
+MEASURES = Measures._fields
+
+# Bin values used by the Histogram: the centers of bins equal divisions of [ 0, 1 ]
+def bin_values( bins ):
+    return 1.0 / ( bins * 2 ) + np.arange( bins ) / bins
+
+# Computes every measure for a stack of frames ( frames x bins ) with the fused
+# kernel (see core.measures). Returns a ( frames x len( MEASURES ) ) array.
+# Frames are processed chunk_size at a time to bound memory
+def frame_stats( frames, values = None, K = 1, a = 1.6, chunk_size = None ):
+    w = np.atleast_2d( np.asarray( frames, dtype = float ) )
+    y = bin_values( w.shape[ 1 ] ) if values is None else np.asarray( values, dtype = float )
+    if( chunk_size is None ):
+        chunk_size = max( w.shape[ 0 ], 1 )
+
+    table = np.empty( ( w.shape[ 0 ], len( MEASURES ) ) )
+    for start in range( 0, w.shape[ 0 ], chunk_size ):
+        table[ start : start + chunk_size ] = np.column_stack( measures( y, w[ start : start + chunk_size ], K, a ) )
+    return table
+
+# Evaluates a collection of animations (a list, or a dict such as the notebook's
+# axioms_freqs) whose frames all have the same number of bins. Every frame of
+# every animation goes through a single frame_stats call. Returns the animation
+# names, the stats table and, per row, the ( animation, frame ) index it came from
+def run( animations, values = None, K = 1, a = 1.6, chunk_size = None ):
+    if( isinstance( animations, dict ) ):
+        names = list( animations.keys() )
+        sequences = list( animations.values() )
+    else:
+        names = list( range( len( animations ) ) )
+        sequences = list( animations )
+
+    frames = np.concatenate( [ np.asarray( s, dtype = float ) for s in sequences ] )
+    sizes = [ len( s ) for s in sequences ]
+    index = np.column_stack( (
+        np.repeat( np.arange( len( sequences ) ), sizes ),
+        np.concatenate( [ np.arange( n ) for n in sizes ] )
+    ) )
+    return names, frame_stats( frames, values, K, a, chunk_size ), index
+
+# Writes the result of run as CSV to an open file, one row per frame
+def write_csv( f, names, table, index ):
+    writer = csv.writer( f )
+    writer.writerow( ( "animation", "frame" ) + MEASURES )
+    for ( anim, frame ), row in zip( index, table ):
+        writer.writerow( [ names[ anim ], frame ] + row.tolist() )
+
+# Writes the result of run to a CSV file
+def save_csv( path, names, table, index ):
+    with open( path, "w", newline = "" ) as f:
+        write_csv( f, names, table, index )
+
+# Evaluates the built-in animations and writes them to the given CSV file (or stdout)
+if __name__ == "__main__":
+    names, table, index = run( ANIMATIONS )
+    if( len( sys.argv ) > 1 ):
+        save_csv( sys.argv[ 1 ], names, table, index )
+    else:
+        write_csv( sys.stdout, names, table, index )
@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import types
+
+import numpy as np
+
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+sys.path.insert( 0, ROOT )
+
+import spline
+import stub_tk
+from core import Estimator, WeightedStats
+
+# Benchmark harness for the statistics, estimator and GUI hot paths. Every case
+# is timed for each bin count and the per-call times (best of as many runs as fit
+# in TIME_BUDGET) are saved as JSON together with the log-log scaling slope of each case
+# and the time of a fixed reference workload, which tells how fast the machine was
+#
+#   python benchmarks/bench.py --out results.json
+#   python benchmarks/bench.py --out new.json --compare results.json
+
+BINS = ( 10, 100, 1000, 10000, 100000 )
+KNS = ( 5, 10, 50 ) # Knot counts for the estimator cases
+QUADRATIC_LIMIT = 1000 # Largest bin count timed with the reference O(n^2) pm
+RUN_TIME = 0.01 # Seconds per timed run (the loop is sized to take about this long)
+TIME_BUDGET = 0.5 # Seconds spent timing each case
+MIN_RUNS = 5
+THRESHOLD = 1.25 # A case is a regression when it gets this many times slower...
+MIN_DIFFERENCE = 50e-6 # ...and at least this many seconds slower per call
+CONFIRM_ROUNDS = 3 # Times a flagged case is measured again before it is reported
+REFERENCE_DATA = np.random.default_rng( 0 ).random( 10000 )
+
+# Time per call of fn: the minimum over as many runs as fit in TIME_BUDGET (at least
+# MIN_RUNS), every run being a loop of calls sized to take about RUN_TIME
+def measure( fn ):
+    timer = timeit.Timer( fn )
+    number = 1
+    while( True ):
+        elapsed = timer.timeit( number )
+        if( elapsed >= RUN_TIME ):
+            break
+        number *= 2
+    best = elapsed / number
+    runs = 1
+    start = time.perf_counter()
+    while( runs < MIN_RUNS or time.perf_counter() - start < TIME_BUDGET ):
+        best = min( best, timer.timeit( number ) / number )
+        runs += 1
+    return best
+
+# Fixed workload (Python loop and NumPy sort, like the cases) that does not depend on the
+# code under test. Its time measures the speed of the machine at the moment
+def reference():
+    s = 0.0
+    for v in REFERENCE_DATA[ : 1000 ].tolist():
+        s += v * v
+    np.sort( REFERENCE_DATA )
+    return s
+
+# Bin values and weights as the Histogram builds them, with random weights
+def histogram_data( bins, rng ):
+    values = [ 1.0 / ( bins * 2 ) + i / bins for i in range( bins ) ]
+    weights = [ float( w ) for w in rng.integers( 0, 10, bins ) ]
+    return values, weights
+
+# WeightedStats cases: mean, std and pm (and the quadratic reference for small bin counts)
+def stats_cases( bins, rng ):
+    stats = WeightedStats( *histogram_data( bins, rng ) )
+    cases = {
+        "WeightedStats.mean": stats.mean,
+        "WeightedStats.std": stats.std,
+        "WeightedStats.pm": stats.pm
+    }
+    if( bins <= QUADRATIC_LIMIT ):
+        cases[ "WeightedStats.pm[quadratic]" ] = lambda: stats.pm( method = "quadratic" )
+    return cases
+
+# Estimator cases for every kn: fit with the solver cached (warm) and rebuilt (cold), and produce
+def estimator_cases( bins, rng ):
+    x = [ 75 + ( i + 0.5 ) * 350 / bins for i in range( bins ) ]
+    y = list( 425 - 35 * rng.integers( 0, 10, bins ) )
+    cases = {}
+    for kn in KNS:
+        est = Estimator()
+        est.fit( x, y, kn )
+
+        def cold( kn = kn ):
+            spline.solver.cache_clear()
+            Estimator().fit( x, y, kn )
+
+        cases[ f"Estimator.fit[kn={kn}]" ] = lambda est = est, kn = kn: est.fit( x, y, kn )
+        cases[ f"Estimator.fit[kn={kn},cold]" ] = cold
+        cases[ f"Estimator.produce[kn={kn}]" ] = lambda est = est: est.produce( x[ 0 ], x[ -1 ], 100 )
+    return cases
+
+# Histogram drag cycle (on_move_press -> draw_graph -> update_stats) against a stub canvas.
+# Every cycle moves one bin between two heights, so each render does real work
+def drag_cases( bins, rng ):
+    import histogram
+    histogram.tk = stub_tk.tk
+
+    h = histogram.Histogram( stub_tk.stub_app(), 500, 500, bins = bins )
+    h.canvas.current = ( h.bin_ids[ bins // 2 ], )
+    h.on_press( types.SimpleNamespace( x = 0, y = 400 ) )
+    heights = [ 400 - 2 * h.height_unit, 400 - 4 * h.height_unit ]
+
+    def cycle():
+        heights.reverse()
+        h.on_move_press( types.SimpleNamespace( x = 0, y = heights[ 0 ] ) )
+        h.canvas.run_pending()
+
+    return { "Histogram.drag": cycle }
+
+# Runs every case for every bin count. Returns { case: { "bins", "seconds", "slope" } }
+# Every bin count gets its own seeded data, so a case can be rebuilt on its own
+def run( bins_list, log = print ):
+    results = {}
+    for bins in bins_list:
+        for build in ( stats_cases, estimator_cases, drag_cases ):
+            for name, fn in build( bins, np.random.default_rng( bins ) ).items():
+                seconds = measure( fn )
+                case = results.setdefault( name, { "bins": [], "seconds": [] } )
+                case[ "bins" ].append( bins )
+                case[ "seconds" ].append( seconds )
+                log( f"{name:32} bins = {bins:>6}  {seconds * 1e6:12.1f} us" )
+    for case in results.values():
+        if( len( case[ "bins" ] ) > 1 ):
+            case[ "slope" ] = float( np.polyfit( np.log( case[ "bins" ] ), np.log( case[ "seconds" ] ), 1 )[ 0 ] )
+        else:
+            case[ "slope" ] = None
+    return results
+
+# Builds and times a single case again
+def remeasure( name, bins ):
+    for build in ( stats_cases, estimator_cases, drag_cases ):
+        cases = build( bins, np.random.default_rng( bins ) )
+        if( name in cases ):
+            return measure( cases[ name ] )
+
+# Compares two runs. Returns the ( case, bins, ratio ) entries slower than threshold times
+# the baseline and by more than min_difference seconds per call (differences of a few
+# microseconds are timing noise, whatever their ratio). Flagged cases are measured again
+# up to CONFIRM_ROUNDS times, keeping their best time. With the reference time of the
+# baseline run (calibration), every new measurement is paired with one of the reference
+# workload and scaled to the speed of the machine during the baseline run, so that a
+# slow spell lasting through every round is not reported as a regression either
+def compare( results, baseline, threshold = THRESHOLD, min_difference = MIN_DIFFERENCE, calibration = None ):
+    regressions = slower( results, baseline, threshold, min_difference )
+    for _ in range( CONFIRM_ROUNDS ):
+        if( not regressions ):
+            break
+        for name, bins, _ in regressions:
+            case = results[ name ]
+            i = case[ "bins" ].index( bins )
+            seconds = remeasure( name, bins )
+            if( calibration ):
+                seconds *= calibration / measure( reference )
+            case[ "seconds" ][ i ] = min( case[ "seconds" ][ i ], seconds )
+        regressions = slower( results, baseline, threshold, min_difference )
+    return regressions
+
+# Entries of results slower than the baseline by both threshold and min_difference
+def slower( results, baseline, threshold, min_difference ):
+    regressions = []
+    for name, case in results.items():
+        if( name not in baseline ):
+            continue
+        base = dict( zip( baseline[ name ][ "bins" ], baseline[ name ][ "seconds" ] ) )
+        for bins, seconds in zip( case[ "bins" ], case[ "seconds" ] ):
+            if( bins in base and seconds > threshold * base[ bins ] and seconds - base[ bins ] > min_difference ):
+                regressions.append( ( name, bins, seconds / base[ bins ] ) )
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser( description = "Benchmarks for the statistics, estimator and GUI hot paths" )
+    parser.add_argument( "--bins", type = int, nargs = "+", default = BINS, help = "bin counts to sweep" )
+    parser.add_argument( "--out", help = "JSON file to save the results to" )
+    parser.add_argument( "--compare", help = "baseline JSON file to check the results against" )
+    parser.add_argument( "--threshold", type = float, default = THRESHOLD, help = "slowdown ratio flagged as a regression" )
+    parser.add_argument( "--min-difference", type = float, default = MIN_DIFFERENCE, help = "smallest slowdown per call (seconds) flagged as a regression" )
+    args = parser.parse_args()
+
+    calibration = measure( reference )
+    results = run( args.bins )
+    regressions = None
+    if( args.compare ):
+        with open( args.compare ) as f:
+            saved = json.load( f )
+        regressions = compare( results, saved[ "results" ], args.threshold, args.min_difference, saved.get( "calibration" ) )
+
+    print()
+    for name, case in results.items():
+        if( case[ "slope" ] is not None ):
+            print( f"{name:32} scaling ~ bins^{case[ 'slope' ]:.2f}" )
+
+    if( args.out ):
+        meta = {
+            "time": time.strftime( "%Y-%m-%dT%H:%M:%S" ),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform()
+        }
+        with open( args.out, "w" ) as f:
+            json.dump( { "meta": meta, "calibration": calibration, "results": results }, f, indent = 2 )
+
+    if( regressions is not None ):
+        print()
+        for name, bins, ratio in regressions:
+            print( f"REGRESSION {name} bins = {bins}: {ratio:.2f}x slower" )
+        if( regressions ):
+            sys.exit( 1 )
+        print( "No regressions" )
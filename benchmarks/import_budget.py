@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+# Checks that the headless core stays cheap to import: "import core" must not
+# pull in the GUI or plotting stacks and must finish within IMPORT_BUDGET seconds.
+# Every measurement runs in a fresh interpreter; the best of RUNS is compared
+#
+#   python benchmarks/import_budget.py
+
+IMPORT_BUDGET = 0.3 # Seconds (NumPy alone takes about 0.1 s)
+RUNS = 5
+FORBIDDEN = ( "tkinter", "matplotlib", "sklearn" )
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+
+PROBE = f"""
+import sys, time
+t = time.perf_counter()
+import core
+print( time.perf_counter() - t )
+print( ",".join( m for m in {FORBIDDEN!r} if m in sys.modules ) )
+"""
+
+# Imports the core in a fresh interpreter. Returns the import time and the forbidden modules loaded
+def measure():
+    out = subprocess.run( [ sys.executable, "-c", PROBE ], cwd = ROOT, capture_output = True, text = True, check = True ).stdout.split( "\n" )
+    return float( out[ 0 ] ), [ m for m in out[ 1 ].split( "," ) if m ]
+
+if __name__ == "__main__":
+    results = [ measure() for _ in range( RUNS ) ]
+    best = min( t for t, _ in results )
+    loaded = sorted( set( m for _, mods in results for m in mods ) )
+    print( f"import core: {best * 1000:.1f} ms (budget {IMPORT_BUDGET * 1000:.0f} ms)" )
+    if( loaded ):
+        print( "FAIL: core imports " + ", ".join( loaded ) )
+    if( best > IMPORT_BUDGET or loaded ):
+        sys.exit( 1 )
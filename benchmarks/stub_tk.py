@@ -0,0 +1,79 @@
+import types
+
+# Minimal stand-ins for the Tk widgets used by Histogram, so its event handlers
+# can be driven without a display. Canvas items are kept as coordinate lists and
+# scheduled callbacks (after / after_idle) wait in a queue until run_pending
+
+class StubCanvas:
+    def __init__( this, *args, **kwargs ):
+        this.items = {}
+        this.jobs = {}
+        this.last_id = 0
+        this.current = () # What find_withtag( "current" ) returns (the item under the mouse)
+
+    def new_id( this ):
+        this.last_id += 1
+        return this.last_id
+
+    def create_item( this, *coords, **options ):
+        i = this.new_id()
+        this.items[ i ] = list( coords )
+        return i
+
+    create_rectangle = create_item
+    create_line = create_item
+    create_text = create_item
+
+    def coords( this, item, *coords ):
+        if( len( coords ) == 0 ):
+            return list( this.items[ item ] )
+        this.items[ item ] = list( coords )
+
+    def delete( this, item ):
+        if( item == "all" ):
+            this.items.clear()
+        else:
+            this.items.pop( item, None )
+
+    def find_withtag( this, tag ):
+        return this.current
+
+    def after( this, ms, callback, *args ):
+        i = this.new_id()
+        this.jobs[ i ] = ( callback, args )
+        return i
+
+    def after_idle( this, callback, *args ):
+        return this.after( 0, callback, *args )
+
+    def after_cancel( this, job ):
+        this.jobs.pop( job, None )
+
+    # Runs every scheduled callback, in scheduling order
+    def run_pending( this ):
+        while( this.jobs ):
+            job = min( this.jobs )
+            callback, args = this.jobs.pop( job )
+            callback( *args )
+
+    def config( this, **options ):
+        pass
+
+    def bind( this, *args ):
+        pass
+
+    def place( this, **options ):
+        pass
+
+class StubLabel:
+    def __init__( this, *args, **kwargs ):
+        this.text = ""
+
+    def config( this, text = "", **options ):
+        this.text = text
+
+# Tk module replacement for histogram.py and the pieces of App that Histogram reads
+tk = types.SimpleNamespace( Canvas = StubCanvas, Label = StubLabel )
+
+def stub_app():
+    return types.SimpleNamespace( main = None, mean_display = StubLabel(), std_display = StubLabel(), pm_display = StubLabel() )
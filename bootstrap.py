@@ -0,0 +1,79 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from axioms import MEASURES, frame_stats
+
+# Bootstrap confidence intervals for the statistics of a histogram. A replicate
+# redraws the N observations of the histogram with replacement, which for binned
+# data is a single multinomial draw over the bin frequencies. Replicates are drawn
+# and scored BATCH_SIZE at a time; every batch has its own seed spawned from the
+# caller's seed, so results do not depend on the number of workers.
+#
+# Runs are serial by default: scoring a batch is so cheap that a process pool
+# only pays off for very large runs or wide histograms. Pass workers > 1 (or None,
+# one per CPU) to use one; on platforms that spawn processes (Windows, macOS)
+# call bootstrap from under an if __name__ == "__main__" guard
+
+BATCH_SIZE = 10000 # Replicates drawn and scored per batch
+CI_MEASURES = ( "pm", "mean", "std", "spread" )
+
+# Counts as an int64 array. Raises ValueError for counts that are not non negative
+# integers, such as relative frequencies (pass the counts and relative = True instead)
+def integer_counts( counts ):
+    c = np.asarray( counts )
+    if( c.dtype.kind not in "iub" ):
+        c = np.asarray( c, dtype = float )
+        if( not np.all( np.isfinite( c ) ) or np.any( c != np.round( c ) ) ):
+            raise ValueError( "bootstrap needs integer counts, not relative frequencies" )
+    if( np.any( c < 0 ) ):
+        raise ValueError( "counts cannot be negative" )
+    return c.astype( np.int64 )
+
+# Draws size replicates of the histogram and scores them. Returns a ( size x len( MEASURES ) )
+# array (see axioms.frame_stats). With relative the replicates are scored as relative frequencies
+def score_replicates( values, counts, size, seed, K = 1, a = 1.6, relative = False ):
+    counts = integer_counts( counts )
+    n = int( counts.sum() )
+    rng = np.random.default_rng( seed )
+    replicates = rng.multinomial( n, counts / n, size = size ).astype( float )
+    if( relative ):
+        replicates /= n
+    return frame_stats( replicates, values, K, a )
+
+# Bootstrap confidence intervals for a histogram of integer counts. Returns
+# { measure: ( estimate, low, high ) } for every measure in measures, where the
+# interval is the percentile interval at the given level over replicates draws
+def bootstrap( values, counts, replicates = 10000, level = 0.95, measures = CI_MEASURES,
+               K = 1, a = 1.6, relative = False, seed = None, workers = 1 ):
+    counts = integer_counts( counts )
+    if( counts.sum() <= 0 ):
+        raise ValueError( "bootstrap needs at least one observation" )
+    if( replicates < 1 ):
+        raise ValueError( "bootstrap needs at least one replicate" )
+    if( workers is None ):
+        workers = os.cpu_count() or 1
+
+    sizes = [ BATCH_SIZE ] * ( replicates // BATCH_SIZE )
+    if( replicates % BATCH_SIZE ):
+        sizes.append( replicates % BATCH_SIZE )
+    seeds = np.random.SeedSequence( seed ).spawn( len( sizes ) )
+    jobs = [ ( values, counts, size, s, K, a, relative ) for size, s in zip( sizes, seeds ) ]
+
+    if( workers > 1 and len( jobs ) > 1 ):
+        with ProcessPoolExecutor( max_workers = workers ) as pool:
+            scores = list( pool.map( score_replicates, *zip( *jobs ) ) )
+    else:
+        scores = [ score_replicates( *job ) for job in jobs ]
+    scores = np.concatenate( scores )
+
+    point = counts / counts.sum() if relative else counts
+    estimate = frame_stats( point, values, K, a )[ 0 ]
+    tail = ( 1 - level ) / 2 * 100
+    intervals = {}
+    for m in measures:
+        column = MEASURES.index( m )
+        low, high = np.percentile( scores[ :, column ], [ tail, 100 - tail ] )
+        intervals[ m ] = ( float( estimate[ column ] ), float( low ), float( high ) )
+    return intervals
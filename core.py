@@ -0,0 +1,116 @@
+from collections import namedtuple
+
+import numpy as np
+
+import spline
+from polarization import PM_METHODS, sorted_distance_terms
+
+# Statistics and estimator core. Only NumPy is needed here, so batch jobs can
+# import this module without loading the GUI (see histogram.py) or matplotlib
+
+# The estimator class takes the bin frequencies and uses a splines
+# approximation algorithm to create a curve that best fits the bins
+# frequencies.
+class Estimator:
+    # Fits the spline coefficients for the points ( x, y ) using kn knots.
+    # The solver for a given ( x, kn ) is cached, so refitting new y values is a single product
+    def fit( this, x, y, kn ):
+        this.kn = kn
+        this.k, pinv = spline.solver( tuple( x ), kn )
+        this.q = pinv @ np.asarray( y, dtype = float )
+
+    # Evaluates the curve on p points between xmin and xmax. Returns a flat array x0, y0, x1, y1, ...
+    def produce( this, xmin, xmax, p ):
+        x, A = spline.evaluator( tuple( this.k ), xmin, xmax, p )
+        xy = np.empty( 2 * p )
+        xy[ 0 :: 2 ] = x
+        xy[ 1 :: 2 ] = A @ this.q
+        return xy
+
+# This class defines some methods to calculate weighted statistics
+class WeightedStats:
+    # Values and weights are initialized
+    def __init__( this, values, weights ):
+        this.values = values
+        this.weights = weights
+        this.stats_vector = [ 0 for _ in range( 3 ) ] # There are three different statistics (mean, std, pm)
+    
+    # Mean
+    def mean( this ):
+        m = 0.0
+        for i in range( len( this.values ) ):
+            m += this.values[ i ] * this.weights[ i ]
+        return m / sum( this.weights )
+    
+    # Standard deviation
+    def std( this ):
+        m = this.mean()
+        s = 0.0
+        for i in range( len( this.values ) ):
+            s += this.weights[ i ] * ( abs( this.values[ i ] - m ) ** 2 )
+        return ( s / sum( this.weights ) ) ** ( 1 / 2 )
+
+    # Polarization measure (as proposed by Esteban & Ray)
+    # method selects the engine: "sorted" (O(n log n), default) or "quadratic" (reference double loop)
+    def pm( this, K = 1, a = 1.6, method = "sorted" ):
+        return PM_METHODS[ method ]( this.values, this.weights, K, a )
+    
+    # Every measure at once (see measures)
+    def measures( this, K = 1, a = 1.6 ):
+        return measures( this.values, this.weights, K, a )
+
+    # Generates a vector that contains the statistics for a given histogram configuration
+    def gen_stats_vector( this ):
+        m = this.measures()
+        this.stats_vector[ 0 ] = m.mean
+        this.stats_vector[ 1 ] = m.std
+        this.stats_vector[ 2 ] = m.pm
+
+# Result of measures, one field per statistic
+Measures = namedtuple( "Measures", ( "mean", "std", "var", "spread", "coverage", "pm" ) )
+
+# Fused kernel: mean, std, var, spread, coverage and pm from a single sort of the
+# values. As in the notebooks, spread is the distance between the outermost non
+# empty bins and coverage counts the empty bins. Everything but pm is undefined
+# (nan) when the weights sum to zero. weights may be a stack of histograms
+# ( histograms x bins ) sharing the same values, then every field is an array
+def measures( values, weights, K = 1, a = 1.6 ):
+    y = np.asarray( values, dtype = float )
+    pi = np.asarray( weights, dtype = float )
+    order = np.argsort( y, kind = "stable" )
+    ys = y[ order ]
+    ws = pi[ ..., order ]
+
+    total = ws.sum( axis = -1 )
+    defined = total > 0
+    with np.errstate( invalid = "ignore", divide = "ignore" ):
+        mean = ( ws @ ys ) / total
+        var = np.einsum( "...b,...b->...", ws, ( ys - mean[ ..., None ] ) ** 2 ) / total
+
+    filled = ws > 0
+    first = np.argmax( filled, axis = -1 )
+    last = ys.shape[ 0 ] - 1 - np.argmax( filled[ ..., : : -1 ], axis = -1 )
+    spread = np.where( defined, ys[ last ] - ys[ first ], np.nan )
+    coverage = np.where( defined, ( ~filled ).sum( axis = -1 ), np.nan )
+
+    pm = K * np.einsum( "...b,...b->...", ws ** ( 1 + a ), sorted_distance_terms( ys, ws ) )
+    return Measures( mean[ () ], np.sqrt( var )[ () ], var[ () ], spread[ () ], coverage[ () ], pm[ () ] )
+
+# Mean, std and pm for every row of a stack of histograms ( histograms x bins ) that
+# share the same bin values, as 1-D arrays. A chunking wrapper over measures: rows are
+# processed chunk_size at a time so the temporaries stay bounded
+def batch_stats( values, weights, K = 1, a = 1.6, chunk_size = None ):
+    w = np.atleast_2d( np.asarray( weights, dtype = float ) )
+    n = w.shape[ 0 ]
+    if( chunk_size is None ):
+        chunk_size = max( n, 1 )
+
+    means = np.empty( n )
+    stds = np.empty( n )
+    pms = np.empty( n )
+    for start in range( 0, n, chunk_size ):
+        m = measures( values, w[ start : start + chunk_size ], K, a )
+        means[ start : start + chunk_size ] = m.mean
+        stds[ start : start + chunk_size ] = m.std
+        pms[ start : start + chunk_size ] = m.pm
+    return means, stds, pms
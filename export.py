@@ -0,0 +1,128 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from axioms import ANIMATIONS, MEASURES, bin_values, frame_stats
+from core import Estimator
+from layout import plot_area
+
+# Offscreen export of axiom animations. Every frame (histogram bars, spline curve
+# and stats panel) is drawn with the Agg backend, so no display is needed, and
+# frames are rendered in parallel by a process pool. Frames are written as a PNG
+# sequence (one directory per animation) or as one GIF per animation
+#
+#   python export.py frames/ --gif
+#
+# Runs with workers > 1 use a process pool: on platforms that spawn processes
+# (Windows, macOS) call export from under an if __name__ == "__main__" guard
+
+FRAME_DURATION = 1500 # ms per frame in GIFs, as in App.animation_routine
+SIZE = ( 8, 5 ) # Inches, at DPI gives the 800x500 app window
+DPI = 100
+KN = 10 # Knots of the spline curve (the app's default)
+
+# Spline curve as the Histogram draws it: fitted on the canvas pixel positions of
+# the bins (default canvas, see layout.plot_area) and mapped back to bin value / frequency units
+def curve( weights, kn, max_freq ):
+    bins = len( weights )
+    left, top, xspace, yspace = plot_area()
+    bottom = top + yspace
+    unit = yspace / max_freq
+    px_x = left + ( np.arange( bins ) + 0.5 ) * xspace / bins
+    px_y = bottom - np.asarray( weights, dtype = float ) * unit
+    est = Estimator()
+    est.fit( px_x, px_y, kn )
+    xy = est.produce( px_x[ 0 ], px_x[ -1 ], 100 )
+    return ( xy[ 0 :: 2 ] - left ) / xspace, ( bottom - xy[ 1 :: 2 ] ) / unit
+
+# Renders one frame. Returns an RGB array ( height x width x 3 ), or writes a PNG when path is given
+def render_frame( weights, stats, title = "", kn = KN, max_freq = 10, path = None ):
+    values = bin_values( len( weights ) )
+    fig = Figure( figsize = SIZE, dpi = DPI )
+    canvas = FigureCanvasAgg( fig )
+    grid = fig.add_gridspec( 1, 2, width_ratios = ( 3, 1 ) )
+
+    hist = fig.add_subplot( grid[ 0 ] )
+    hist.bar( values, weights, width = 1 / len( weights ), color = "blue", edgecolor = "black" )
+    hist.plot( *curve( weights, kn, max_freq ), color = "orange", linewidth = 3 )
+    hist.set_xlim( 0, 1 )
+    hist.set_ylim( 0, max_freq )
+    hist.set_title( title )
+
+    panel = fig.add_subplot( grid[ 1 ] )
+    panel.axis( "off" )
+    lines = [ f"{m.upper()} = {s:.3g}" if np.isfinite( s ) else f"{m.upper()} = UNDEFINED" for m, s in zip( MEASURES, stats ) ]
+    panel.text( 0, 0.9, "\n".join( lines ), va = "top", family = "monospace" )
+
+    if( path is not None ):
+        fig.savefig( path )
+        return path
+    canvas.draw()
+    return np.asarray( canvas.buffer_rgba() )[ :, :, : 3 ].copy()
+
+# Renders a list of frame jobs ( weights, stats, title, kn, max_freq, path ), in order
+def render_frames( jobs, workers = None ):
+    if( workers is None ):
+        workers = os.cpu_count() or 1
+    if( workers > 1 and len( jobs ) > 1 ):
+        with ProcessPoolExecutor( max_workers = workers ) as pool:
+            yield from pool.map( render_frame, *zip( *jobs ), chunksize = max( 1, len( jobs ) // ( 4 * workers ) ) )
+    else:
+        for job in jobs:
+            yield render_frame( *job )
+
+# Exports a collection of animations (a list, or a dict such as the notebook's
+# axioms_freqs) into out_dir. Stats come from one axioms.frame_stats call per
+# animation and the frames of every animation share one process pool. With gif
+# each animation becomes <name>.gif, otherwise <name>/frame-0000.png, ...
+# Returns the paths written
+def export( animations, out_dir, gif = False, kn = KN, workers = None ):
+    if( isinstance( animations, dict ) ):
+        named = list( animations.items() )
+    else:
+        named = [ ( f"animation-{i}", a ) for i, a in enumerate( animations ) ]
+    os.makedirs( out_dir, exist_ok = True )
+
+    jobs = []
+    owners = [] # Animation index of every job
+    for i, ( name, frames ) in enumerate( named ):
+        table = frame_stats( frames )
+        max_freq = max( 10, int( np.max( frames ) ) )
+        if( not gif ):
+            os.makedirs( os.path.join( out_dir, str( name ) ), exist_ok = True )
+        for f, weights in enumerate( frames ):
+            path = None if gif else os.path.join( out_dir, str( name ), f"frame-{f:04d}.png" )
+            jobs.append( ( weights, table[ f ], f"{name} ({f + 1}/{len( frames )})", kn, max_freq, path ) )
+            owners.append( i )
+
+    if( not gif ):
+        return list( render_frames( jobs, workers ) )
+
+    from PIL import Image # Pillow ships with matplotlib
+
+    # Frames arrive in order; every animation is written as soon as its last frame is in
+    paths = []
+    images = []
+    for i, image in zip( owners, render_frames( jobs, workers ) ):
+        images.append( Image.fromarray( image ) )
+        if( len( images ) == len( named[ i ][ 1 ] ) ):
+            path = os.path.join( out_dir, f"{named[ i ][ 0 ]}.gif" )
+            images[ 0 ].save( path, save_all = True, append_images = images[ 1 : ], duration = FRAME_DURATION, loop = 0 )
+            paths.append( path )
+            images = []
+    return paths
+
+# Exports the built-in animations
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser( description = "Renders the axiom animations offscreen" )
+    parser.add_argument( "out_dir", help = "directory to write the frames to" )
+    parser.add_argument( "--gif", action = "store_true", help = "write one GIF per animation instead of PNG frames" )
+    parser.add_argument( "--kn", type = int, default = KN, help = "knots of the spline curve" )
+    parser.add_argument( "--workers", type = int, default = None, help = "rendering processes (default: one per CPU)" )
+    args = parser.parse_args()
+    for path in export( ANIMATIONS, args.out_dir, args.gif, args.kn, args.workers ):
+        print( path )
@@ -1,115 +1,30 @@
+import atexit
+import os
+import sys
+import time
+
 import numpy as np
-from sklearn.linear_model import LinearRegression
+from core import Estimator, WeightedStats
+from polarization import IncrementalStats
+from axioms import ANIMATIONS, MEASURES, frame_stats
+from layout import CANVAS_SIZE, FRAME_MARGIN, plot_area
+from instrument import PROFILER, timed
 
 import tkinter as tk
 from tkinter import ttk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# The estimator class takes the bin frequencies and uses a splines
-# approximation algorithm to create a curve that best fits the bins
-# frequencies.
-class Estimator:
-    def fit( this, x, y, kn ):
-        A = [ [] for _ in range( len( x ) ) ]
-
-        xmin = min( x )
-        xmax = max( x )
-
-        step = ( xmax - xmin ) / ( kn + 1 )
-        this.kn = kn
-        this.k = [ xmin + step ]
-        for ki in range( kn - 1 ):
-            this.k.append( this.k[ ki ] + step )
-
-        xi = 0
-        ki = 0
-
-        while( xi < len( x ) ):
-            if( ki < kn and x[ xi ] >= this.k[ ki ] ):
-                ki += 1
-            else:
-                for i in range( 4 ):
-                    A[ xi ].append( x[ xi ] ** i )
-                for i in range( 4, 4 + ki ):
-                    A[ xi ].append( ( x[ xi ] - this.k[ i - 4 ] ) ** 3 )
-                for i in range( 4 + ki, 4 + kn ):
-                    A[ xi ].append( 0 )
-                xi += 1
-                
-        model = LinearRegression( fit_intercept = False ).fit( A, y )
-        this.q = model.coef_
-
-    def produce( this, xmin, xmax, p ):
-        x = np.linspace( xmin, xmax, p )
-        xy = []
-
-        xi = 0
-        ki = 0
-
-        while( xi < x.shape[ 0 ] ):
-            if( ki < this.kn and x[ xi ] >= this.k[ ki ] ):
-                ki += 1
-            else:
-                yi = 0
-                for i in range( 4 ):
-                    yi += this.q[ i ] * ( x[ xi ] ** i )
-                for i in range( 4, 4 + ki ):
-                    yi += this.q[ i ] * ( ( x[ xi ] - this.k[ i - 4 ] ) ** 3 )
-                xy.append( x[ xi ] )
-                xy.append( yi )
-                xi += 1
-
-        return xy
-
-# This class defines some methods to calculate weighted statistics
-class WeightedStats:
-    # Values and weights are initialized
-    def __init__( this, values, weights ):
-        this.values = values
-        this.weights = weights
-        this.stats_vector = [ 0 for _ in range( 3 ) ] # There are three different statistics (mean, std, pm)
-    
-    # Mean
-    def mean( this ):
-        m = 0.0
-        for i in range( len( this.values ) ):
-            m += this.values[ i ] * this.weights[ i ]
-        return m / sum( this.weights )
-    
-    # Standard deviation
-    def std( this ):
-        m = this.mean()
-        s = 0.0
-        for i in range( len( this.values ) ):
-            s += this.weights[ i ] * ( abs( this.values[ i ] - m ) ** 2 )
-        return ( s / sum( this.weights ) ) ** ( 1 / 2 )
-
-    # Polarization measure (as proposed by Esteban & Ray)
-    def pm( this, K = 1, a = 1.6 ):
-        p = 0.0
-        for i in range( len( this.values ) ):
-            for j in range( len( this.values ) ):
-                p += ( ( this.weights[ i ] ** ( 1 + a ) ) * this.weights[ j ] ) * abs( this.values[ i ] - this.values[ j ] )
-        return K * p
-    
-    # Generates a vector that contains the statistics for a given histogram configuration
-    def gen_stats_vector( this ):
-        this.stats_vector[ 0 ] = this.mean()
-        this.stats_vector[ 1 ] = this.std()
-        this.stats_vector[ 2 ] = this.pm()
 
 # This class defines the histogram. It deals with it's visualization and behavior
 class Histogram:
-    # Determines the index of a bin on the bin array based on its index
+    FRAME_INTERVAL = 16 # Minimum time between two renders while dragging (ms), about 60 fps
+
+    # Determines the index of a bin on the bin array based on its id
     def where_id_is( this, id ):
-        for i in range( this.bins ):
-            if( this.bin_ids[ i ] == id ):
-                return i
-        return None
+        return this.bin_index.get( id )
 
     # When left click is pressed, determine if user's mouse is over a bin, and mark it as selected
+    @timed( "Histogram.on_press" )
     def on_press( this, event ):
+        this.flush_motion() # A pending drag of the previous bin is applied first
         this.selected_bin = this.canvas.find_withtag( "current" ) # Get element under mouse
         if( len( this.selected_bin ) > 0 and this.selected_bin[ 0 ] != this.histogram_frame ):
             this.selected_bin = this.selected_bin[ 0 ] # Mark bin as selected
@@ -118,43 +33,77 @@ class Histogram:
         else:
             this.selected_bin = None # No bin was selected
     
-    # When mouse moves (while click on hold), update bin data and display based on distance traveled by mouse
+    # When mouse moves (while click on hold), only the latest mouse position is stored.
+    # Motion events are coalesced: the histogram is rendered at most once every
+    # FRAME_INTERVAL ms, once Tk is idle, with the last position received
+    @timed( "Histogram.on_move_press" )
     def on_move_press( this, event ):
+        this.pending_motion = event.y
+        if( this.motion_job is not None ):
+            PROFILER.count( "motion.coalesced" ) # Merged into the render already scheduled
+        else:
+            wait = this.last_render + this.FRAME_INTERVAL - time.perf_counter() * 1000
+            if( wait > 0 ):
+                this.motion_job = this.canvas.after( int( wait ) + 1, this.render_motion )
+            else:
+                this.motion_job = this.canvas.after_idle( this.render_motion )
+
+    # Renders a pending motion right away (if there is one)
+    def flush_motion( this ):
+        if( this.motion_job is not None ):
+            this.canvas.after_cancel( this.motion_job )
+            this.render_motion()
+
+    # Updates bin data and display based on distance traveled by mouse
+    @timed( "Histogram.render_motion" )
+    def render_motion( this ):
+        this.motion_job = None
+        this.last_render = time.perf_counter() * 1000
+        y = this.pending_motion
         bin_index = this.where_id_is( this.selected_bin ) # Get bin index on array based on its id (to update frequency)
         if( bin_index != None and
-            this.bin_on_click[ 1 ] - ( this.mouse_on_click[ 1 ] - event.y ) < this.canvas_height - this.hmargin_to_plot and
-            this.bin_on_click[ 1 ] - ( this.mouse_on_click[ 1 ] - event.y ) > this.hmargin_to_plot
+            this.bin_on_click[ 1 ] - ( this.mouse_on_click[ 1 ] - y ) < this.canvas_height - this.hmargin_to_plot and
+            this.bin_on_click[ 1 ] - ( this.mouse_on_click[ 1 ] - y ) > this.hmargin_to_plot
         ):
             # Distance traveled by the mouse is calculated and histogram is updated accordingly
-            dif = this.bin_on_click[ 3 ] - ( this.bin_on_click[ 1 ] - ( this.mouse_on_click[ 1 ] - event.y ) )
+            dif = this.bin_on_click[ 3 ] - ( this.bin_on_click[ 1 ] - ( this.mouse_on_click[ 1 ] - y ) )
             n = round( dif / this.height_unit )
-            this.canvas.coords( this.selected_bin, this.bin_on_click[ 0 ], this.bin_on_click[ 3 ] - n * this.height_unit, *this.bin_on_click[ 2 : 4 ] )
+            if( n == this.active_weights[ bin_index ] ): # Nothing changed, nothing to redraw
+                PROFILER.count( "motion.unchanged" )
+                return
+            with PROFILER.span( "canvas.bin" ):
+                this.canvas.coords( this.selected_bin, this.bin_on_click[ 0 ], this.bin_on_click[ 3 ] - n * this.height_unit, *this.bin_on_click[ 2 : 4 ] )
             this.px_y_vals[ bin_index ] = this.bin_on_click[ 3 ] - n * this.height_unit
             this.draw_graph()
             this.active_weights[ bin_index ] = n
+            this.stats_state.set_weight( bin_index, n ) # Only the dragged bin changed
             this.update_stats()
 
     # Every time a change is triggered in the histogram, statistics must be updated
+    # Statistics are read from the cached state, which is kept in sync with active_weights
+    @timed( "Histogram.update_stats" )
     def update_stats( this ):
-        stats = WeightedStats( this.active_values, this.active_weights ) # Set values and weights
-        if( sum( this.active_weights ) > 0 ): # Sum of weights must be greater than zero for mean and std calculation
-            mean = stats.mean()
-            std = stats.std()
-            this.mean_display.config( text = f"MEAN = {mean:.1f}" ) # Updates GUI
-            this.std_display.config( text = f"STD = {std:.1f}" ) # Updates GUI
-        else: # Set statistics to undefined
-            this.mean_display.config( text = f"MEAN = UNDEFINED" ) # Updates GUI
-            this.std_display.config( text = f"STD = UNDEFINED" ) # Updates GUI
-        pm = stats.pm()
-        this.pm_display.config( text = f"PM = {pm:.1f}" ) # Updates GUI
+        stats = this.stats_state
+        with PROFILER.span( "IncrementalStats" ):
+            defined = stats.total > 0 # Sum of weights must be greater than zero for mean and std calculation
+            if( defined ):
+                mean = stats.mean()
+                std = stats.std()
+            pm = stats.pm()
+        with PROFILER.span( "labels" ):
+            if( defined ):
+                this.mean_display.config( text = f"MEAN = {mean:.1f}" ) # Updates GUI
+                this.std_display.config( text = f"STD = {std:.1f}" ) # Updates GUI
+            else: # Set statistics to undefined
+                this.mean_display.config( text = f"MEAN = UNDEFINED" ) # Updates GUI
+                this.std_display.config( text = f"STD = UNDEFINED" ) # Updates GUI
+            this.pm_display.config( text = f"PM = {pm:.1f}" ) # Updates GUI
 
     # Initializes histogram. There is a bunch code here that just makes sure the histogram looks good
     def init_histogram( this ):
         ############################################################################################
         # Creates the canvas that holds the histogram, and the histogram viewport
         ############################################################################################
-        this.yspace = this.canvas_height - 2 * this.hmargin_to_plot
-        this.xspace = this.canvas_width - 2 * this.wmargin_to_plot
         this.height_unit = this.yspace / this.max_freq
         this.bin_width = this.xspace / this.bins
         this.histogram_frame = this.canvas.create_rectangle( this.wmargin_to_frame,
@@ -169,7 +118,7 @@ class Histogram:
         this.yaxis_line_ids = []
         this.px_x_vals = [] # For estimator
         this.px_y_vals = [] # For estimator
-        this.graph_line_ids = [] # For estimator
+        this.graph_line_id = None # For estimator
         hbase = this.hmargin_to_frame + this.canvas_height * 0.05
         for i in range( this.max_freq + 1 ):
             this.yaxis_text_ids.append(
@@ -190,6 +139,7 @@ class Histogram:
         # Creates each bin (rectangle) and also the bin array (for frequencies) and populates it
         ############################################################################################
         this.bin_ids = []
+        this.bin_index = {} # Bin id -> index on the bin array
         this.standby_values = [ 0 for _ in range( this.bins ) ]
         this.standby_weights = [ 0 for _ in range( this.bins ) ]
         this.active_values = [ 0 for _ in range( this.bins ) ]
@@ -200,11 +150,13 @@ class Histogram:
                                           this.wmargin_to_plot + ( i + 1 ) * this.xspace / this.bins,
                                           this.canvas_height - this.hmargin_to_plot,
                                           fill = "blue" ) )
+            this.bin_index[ this.bin_ids[ i ] ] = i
             this.active_weights[ i ] = 1.0
             this.active_values[ i ] = 1.0 / ( this.bins * 2 ) + i / this.bins
         ############################################################################################
             this.px_x_vals.append( this.wmargin_to_plot + i * this.xspace / this.bins + this.bin_width / 2 )
             this.px_y_vals.append( this.canvas_height - this.hmargin_to_plot - this.height_unit )
+        this.stats_state = IncrementalStats( this.active_values, this.active_weights ) # Cached statistics
         this.draw_graph()
 
     # Constructor method. Allows for histogram to have a parametric amount of bins and max frequency of each bin
@@ -219,15 +171,19 @@ class Histogram:
         #########################################################
         this.canvas_width = width
         this.canvas_height = height
-        this.wmargin_to_frame = this.canvas_width * 0.1
-        this.hmargin_to_frame = this.canvas_height * 0.1
-        this.wmargin_to_plot = this.canvas_width * 0.15
-        this.hmargin_to_plot = this.canvas_height * 0.15
+        this.wmargin_to_frame = this.canvas_width * FRAME_MARGIN
+        this.hmargin_to_frame = this.canvas_height * FRAME_MARGIN
+        this.wmargin_to_plot, this.hmargin_to_plot, this.xspace, this.yspace = plot_area( this.canvas_width, this.canvas_height )
         #########################################################
 
         this.bins = bins # Number of bins
         this.max_freq = max_freq # Max bin frequency
 
+        this.estimator = Estimator() # Reused on every redraw (its solver is cached)
+        this.motion_job = None # Scheduled render of coalesced motion events
+        this.pending_motion = None # Latest mouse position while dragging
+        this.last_render = 0.0 # Time of last render while dragging (ms)
+
         # Histogram canvas is created
         this.canvas = tk.Canvas( app.main,
                                  width = this.canvas_width,
@@ -244,12 +200,15 @@ class Histogram:
     def reset( this, width, height, bins = 10, max_freq = 10 ):
         this.canvas_width = width
         this.canvas_height = height
-        this.wmargin_to_frame = this.canvas_width * 0.1
-        this.hmargin_to_frame = this.canvas_height * 0.1
-        this.wmargin_to_plot = this.canvas_width * 0.15
-        this.hmargin_to_plot = this.canvas_height * 0.15
+        this.wmargin_to_frame = this.canvas_width * FRAME_MARGIN
+        this.hmargin_to_frame = this.canvas_height * FRAME_MARGIN
+        this.wmargin_to_plot, this.hmargin_to_plot, this.xspace, this.yspace = plot_area( this.canvas_width, this.canvas_height )
         this.bins = bins
         this.max_freq = max_freq
+        if( this.motion_job is not None ): # Drop a pending drag, its bin is about to be deleted
+            this.canvas.after_cancel( this.motion_job )
+            this.motion_job = None
+            PROFILER.count( "motion.dropped" )
         this.canvas.delete( "all" )
         this.canvas.config( width = this.canvas_width, height = this.canvas_height )
         this.init_histogram()
@@ -266,99 +225,80 @@ class Histogram:
                 bin_coords[ 3 ] - weights[ i ] * this.height_unit,
                 *bin_coords[ 2 : 4 ]
             )
+        this.stats_state.reset( this.active_weights )
 
     # Uses the Estimator class to create apoxximated curve and draws it
+    # The curve item is created once and then moved with coords
+    @timed( "Histogram.draw_graph" )
     def draw_graph( this ):
-        for i in range( len( this.graph_line_ids ) - 1, -1, -1 ):
-            this.canvas.delete( this.graph_line_ids[ i ] )
-            this.graph_line_ids.pop()
-        est = Estimator()
-        est.fit( this.px_x_vals, this.px_y_vals, this.kn )
-        xy = est.produce( this.px_x_vals[ 0 ], this.px_x_vals[ -1 ], 100 )
-        this.graph_line_ids.append( this.canvas.create_line( *xy, width = 3, fill = "orange" ) )
+        with PROFILER.span( "Estimator.fit" ):
+            this.estimator.fit( this.px_x_vals, this.px_y_vals, this.kn )
+        with PROFILER.span( "Estimator.produce" ):
+            xy = this.estimator.produce( this.px_x_vals[ 0 ], this.px_x_vals[ -1 ], 100 )
+        with PROFILER.span( "canvas.curve" ):
+            if( this.graph_line_id is None ):
+                this.graph_line_id = this.canvas.create_line( *xy, width = 3, fill = "orange" )
+            else:
+                this.canvas.coords( this.graph_line_id, *xy )
 
 # App class
 class App:
-    # Defines transitions for Esteban & Ray axioms animations
-    # Each animation is modelled here as an array of bin frequencies
-    # Each array is a 'snapshot' of the whole animation
+    # Defines transitions for Esteban & Ray axioms animations (see axioms.ANIMATIONS)
     def define_animations( this ):
-        this.animations = []
-        this.animations.append(
-            [ [ 10, 0, 0, 0, 5, 0, 0, 0, 5, 0 ],
-              [ 10, 0, 0, 0, 4, 1, 0, 1, 4, 0 ],
-              [ 10, 0, 0, 0, 3, 1, 2, 1, 3, 0 ],
-              [ 10, 0, 0, 0, 2, 1, 4, 1, 2, 0 ],
-              [ 10, 0, 0, 0, 1, 1, 6, 1, 1, 0 ],
-              [ 10, 0, 0, 0, 0, 1, 8, 1, 0, 0 ],
-              [ 10, 0, 0, 0, 0, 0, 10, 0, 0, 0 ] ]
-        )
-        this.animations.append(
-            [ [ 10, 0, 0, 0, 0, 3, 0, 0, 0, 6 ],
-              [ 10, 0, 0, 0, 0, 2, 1, 0, 0, 6 ],
-              [ 10, 0, 0, 0, 0, 1, 1, 1, 0, 6 ],
-              [ 10, 0, 0, 0, 0, 0, 1, 2, 0, 6 ],
-              [ 10, 0, 0, 0, 0, 0, 0, 3, 0, 6 ] ]
-        )
-        this.animations.append(
-            [ [ 6, 0, 0, 0, 0, 8, 0, 0, 0, 6 ],
-              [ 6, 0, 0, 0, 1, 6, 1, 0, 0, 6 ],
-              [ 6, 0, 0, 1, 1, 4, 1, 1, 0, 6 ],
-              [ 6, 0, 1, 1, 1, 2, 1, 1, 1, 6 ],
-              [ 6, 1, 1, 1, 1, 0, 1, 1, 1, 7 ],
-              [ 7, 1, 1, 1, 0, 0, 0, 1, 1, 8 ],
-              [ 8, 1, 1, 0, 0, 0, 0, 0, 1, 9 ],
-              [ 9, 1, 0, 0, 0, 0, 0, 0, 0, 10 ],
-              [ 10, 0, 0, 0, 0, 0, 0, 0, 0, 10 ], ]
-        )
+        this.animations = ANIMATIONS
 
     # Updates histogram based on selected 'snapshot' of a given animation
+    @timed( "App.animation_routine" )
     def animation_routine( this, animation, select ):
         this.histogram.set_weights( animation[ select ] ) # Sets weights of histogram based on 'snapshot'
         this.histogram.update_stats() # Updates statistics
-        stats = WeightedStats( this.histogram.active_values, this.histogram.active_weights )
-        stats.gen_stats_vector() # Generate stat vector for statistics visualization (with matplotlib)
-        for i in range( len( stats.stats_vector ) ):
-            this.stats_progressions[ i ][ select ] = stats.stats_vector[ i ] # Adds metrics to stats progression (array that holds change of statistics over time)
         if( select < len( animation ) - 1 ):
             this.main.after( 1500, this.animation_routine, animation, select + 1 ) # Wait for 1.5 seconds before going again
         else:
             this.animation_running = False # Animation is over
 
     # Sets up everything for animation to run correctly
+    @timed( "App.prepare_animation" )
     def prepare_animation( this ):
         if( not this.animation_running ):
             this.animation_running = True
             this.histogram.reset( this.histogram.canvas_width, this.histogram.canvas_width )
             animation = this.animations[ this.animation_select.current() ]
             this.last_animation_size = len( animation )
+            # Stats progressions (change of statistics over time) are computed for every frame at once
+            table = frame_stats( animation, this.histogram.active_values )
+            this.stats_progressions = table[ :, [ MEASURES.index( m ) for m in ( "mean", "std", "pm" ) ] ].T
             this.histogram.set_weights( animation[ 0 ] )
             this.histogram.update_stats()
-            stats = WeightedStats( this.histogram.active_values, this.histogram.active_weights )
-            stats.gen_stats_vector()
-            for i in range( len( stats.stats_vector ) ):
-                this.stats_progressions[ i ][ 0 ] = stats.stats_vector[ i ]
             this.main.after( 1500, this.animation_routine, animation, 1 )
 
     # Uses matplotlib to plot the way a statistic evolved over time during the animation of an axiom
+    @timed( "App.plot_progressions" )
     def plot_progressions( this ):
         if( not this.animation_running ): # Check that animation is not running
             progs = this.stats_progressions[ this.progression_select.current() ]
-            fig = Figure( figsize = ( 5, 5 ), dpi = 50 )
-            progs_plot = fig.add_subplot( 111 )
-            progs_plot.plot( progs[ : this.last_animation_size ] )
+            if( this.progressions_canvas is None ): # Figure and Tk canvas are created once, then reused
+                # Plotting stack is only loaded the first time a progression is plotted
+                from matplotlib.figure import Figure
+                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-            canvas = FigureCanvasTkAgg( fig, master = this.main )
-            canvas.draw()
+                fig = Figure( figsize = ( 5, 5 ), dpi = 50 )
+                this.progressions_plot = fig.add_subplot( 111 )
+                this.progressions_canvas = FigureCanvasTkAgg( fig, master = this.main )
+                this.progressions_canvas.get_tk_widget().place( x = 505, y = 500 * 0.1 + 150 )
 
-            canvas.get_tk_widget().place( x = 505, y = 500 * 0.1 + 150 )
+            this.progressions_plot.clear()
+            this.progressions_plot.plot( progs[ : this.last_animation_size ] )
+            with PROFILER.span( "FigureCanvasTkAgg.draw" ):
+                this.progressions_canvas.draw()
 
     # Constructor method for the app
     def __init__( this ):
         this.define_animations() # Add animations
-        this.stats_progressions = [ [ 0 for _ in range( 10 ) ] for _ in range( 3 ) ] # Creates progression array
+        this.stats_progressions = np.zeros( ( 3, 0 ) ) # Creates progression array (mean, std, pm)
         
         this.last_animation_size = 0 # Animation size is used to know when animation ends
+        this.progressions_canvas = None # Matplotlib canvas for stats progressions (created on first plot)
         this.animation_running = False # Know if animation is running
         
         # Creates app window
@@ -371,7 +311,7 @@ class App:
         this.pm_display = tk.Label( this.main, background = "white", borderwidth = 1, relief = "solid" )
 
         # Creates histogram
-        this.histogram = Histogram( this, 500, 500 )
+        this.histogram = Histogram( this, CANVAS_SIZE, CANVAS_SIZE )
         
         # Creates button to trigger animation
         this.animation_run = tk.Button( this.main, text = "Animate: ", command = this.prepare_animation )
@@ -404,8 +344,15 @@ class App:
         this.animation_select.place( x = 500 * 0.1 + 70, y = 460 )
         this.view_progressions.place( x = 505, y = 500 * 0.1 + 100 )
         this.progression_select.place( x = 505 + 45, y = 500 * 0.1 + 100 )
+
+        # On-screen latency readout when profiling
+        if( PROFILER.enabled ):
+            this.latency_display = tk.Label( this.main, background = "white", borderwidth = 1, relief = "solid" )
+            this.latency_display.place( x = 505, y = 500 * 0.1 + 75 )
+            this.refresh_latency()
     
     # Change value of the kn parameter of the estimator
+    @timed( "App.change_kn" )
     def change_kn( this ):
         try:
             kn = int( this.kn_select.get() )
@@ -415,6 +362,23 @@ class App:
             this.histogram.kn = kn
             this.histogram.draw_graph()
 
-# Launch app
-app = App()
-app.main.mainloop()
\ No newline at end of file
+    # Shows the latest drag render latency (only when profiling)
+    def refresh_latency( this ):
+        last = PROFILER.last.get( "Histogram.render_motion" )
+        if( last is not None ):
+            this.latency_display.config( text = f"RENDER = {last * 1000:.1f} ms" )
+        this.main.after( 250, this.refresh_latency )
+
+# Launches the app. Importing this module does not open a window
+# With profile (or HISTOGRAM_PROFILE=1) callbacks are instrumented and a summary is
+# written at exit to stderr, or to the file named by HISTOGRAM_PROFILE_OUT
+def main( profile = False ):
+    if( profile ):
+        PROFILER.enable()
+    if( PROFILER.enabled ):
+        atexit.register( PROFILER.dump, os.environ.get( "HISTOGRAM_PROFILE_OUT" ) )
+    app = App()
+    app.main.mainloop()
+
+if __name__ == "__main__":
+    main( profile = "--profile" in sys.argv[ 1 : ] )
\ No newline at end of file
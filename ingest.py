@@ -0,0 +1,62 @@
+import numpy as np
+
+# Ingestion of raw observations (one value per respondent) into histogram
+# values and weights. Files are memory-mapped and read CHUNK_SIZE elements at a
+# time, so peak memory depends on the chunk size and the number of bins, not on
+# the number of rows. frequencies has one bin per distinct value, so it is meant for
+# discrete columns (answers on a scale); continuous columns go through binned. The result goes straight into WeightedStats or the kernels
+# in polarization.py, e.g.
+#
+#   values, weights = frequencies( load( "wave1.npy" ) )
+#   pm = pm_sorted( values, weights )
+
+CHUNK_SIZE = 1 << 22 # Elements per chunk (32 MB of float64)
+MAX_DISTINCT = 1 << 16 # Distinct values frequencies accepts
+
+# Opens a 1-D column without reading it. .npy files carry their own dtype and
+# shape; any other file is read as raw binary of the given dtype, starting at offset bytes
+def load( path, dtype = None, offset = 0 ):
+    if( str( path ).endswith( ".npy" ) ):
+        data = np.load( path, mmap_mode = "r" )
+    else:
+        data = np.memmap( path, dtype = dtype or np.float64, mode = "r", offset = offset )
+    return data.reshape( -1 )
+
+# Yields consecutive chunks of a column as in-memory arrays
+def chunks( data, chunk_size = CHUNK_SIZE ):
+    for start in range( 0, data.shape[ 0 ], chunk_size ):
+        yield np.asarray( data[ start : start + chunk_size ] )
+
+# Frequency of every distinct observed value (the chunked equivalent of the
+# notebooks' getFrequency followed by dictToLists). Returns the sorted distinct
+# values and their counts. Every chunk is merged with the distinct values seen so
+# far, so this is for discrete or low cardinality columns: raises ValueError once
+# there are more than max_distinct values (bin continuous columns with binned)
+def frequencies( data, chunk_size = CHUNK_SIZE, max_distinct = MAX_DISTINCT ):
+    values = np.zeros( 0, dtype = data.dtype )
+    counts = np.zeros( 0, dtype = np.int64 )
+    for chunk in chunks( data, chunk_size ):
+        u, c = np.unique( chunk, return_counts = True )
+        values, inverse = np.unique( np.concatenate( ( values, u ) ), return_inverse = True )
+        counts = np.bincount( inverse, weights = np.concatenate( ( counts, c ) ), minlength = values.shape[ 0 ] ).astype( np.int64 )
+        if( values.shape[ 0 ] > max_distinct ):
+            raise ValueError( f"more than {max_distinct} distinct values, use binned for continuous data" )
+    return values, counts
+
+# Counts of observations falling in the bins defined by edges (as np.histogram:
+# every bin is half open except the last one). Observations outside the edges are
+# dropped. Returns the bin centers and the counts
+def binned( data, edges, chunk_size = CHUNK_SIZE ):
+    edges = np.asarray( edges, dtype = float )
+    bins = edges.shape[ 0 ] - 1
+    counts = np.zeros( bins, dtype = np.int64 )
+    for chunk in chunks( data, chunk_size ):
+        idx = np.searchsorted( edges, chunk, side = "right" ) - 1
+        idx[ chunk == edges[ -1 ] ] = bins - 1 # Last bin is closed
+        counts += np.bincount( idx[ ( idx >= 0 ) & ( idx < bins ) ], minlength = bins )
+    return ( edges[ : -1 ] + edges[ 1 : ] ) / 2, counts
+
+# Relative frequencies (the equivalent of the notebooks' getRelativeFrequency)
+def relative( counts ):
+    counts = np.asarray( counts, dtype = float )
+    return counts / counts.sum()
@@ -0,0 +1,105 @@
+import contextlib
+import functools
+import os
+import sys
+import time
+
+# Opt-in instrumentation for the GUI event loop. When disabled (the default) a
+# timed callback costs one flag check and a span is a shared null context.
+# When enabled, every callback and span keeps its call count and a latency
+# histogram with power-of-two buckets in microseconds, and named counters track
+# events such as coalesced or dropped motion events. Enable it with the
+# HISTOGRAM_PROFILE=1 environment variable or python histogram.py --profile
+
+BUCKETS = 32 # Bucket b holds latencies below 2 ^ b us
+
+class Profiler:
+    def __init__( this, enabled = False ):
+        this.enabled = enabled
+        this.stats = {} # name -> [ calls, total seconds, max seconds, buckets ]
+        this.counters = {} # name -> count
+        this.last = {} # name -> latest latency (seconds)
+
+    def enable( this ):
+        this.enabled = True
+
+    # Records one call of name that took the given seconds
+    def record( this, name, seconds ):
+        s = this.stats.get( name )
+        if( s is None ):
+            s = this.stats[ name ] = [ 0, 0.0, 0.0, [ 0 ] * BUCKETS ]
+        s[ 0 ] += 1
+        s[ 1 ] += seconds
+        s[ 2 ] = max( s[ 2 ], seconds )
+        s[ 3 ][ min( int( seconds * 1e6 ).bit_length(), BUCKETS - 1 ) ] += 1
+        this.last[ name ] = seconds
+
+    # Increments a counter
+    def count( this, name, n = 1 ):
+        if( this.enabled ):
+            this.counters[ name ] = this.counters.get( name, 0 ) + n
+
+    # Context manager timing a block of code under name
+    def span( this, name ):
+        return Span( this, name ) if this.enabled else NULL_SPAN
+
+    # Upper bound (us) of the bucket holding the q-th quantile of a latency histogram
+    def quantile( this, buckets, q ):
+        target = q * sum( buckets )
+        seen = 0
+        for b, n in enumerate( buckets ):
+            seen += n
+            if( seen >= target ):
+                return 1 << b
+        return 1 << ( BUCKETS - 1 )
+
+    # Text summary: one line per callback or span, then the counters
+    def summary( this ):
+        lines = [ f"{'name':36} {'calls':>8} {'mean us':>10} {'p50 us <=':>10} {'p95 us <=':>10} {'max us':>10}" ]
+        for name, ( calls, total, worst, buckets ) in sorted( this.stats.items(), key = lambda item: -item[ 1 ][ 1 ] ):
+            lines.append( f"{name:36} {calls:8} {total / calls * 1e6:10.1f} {this.quantile( buckets, 0.5 ):10} {this.quantile( buckets, 0.95 ):10} {worst * 1e6:10.1f}" )
+        for name, n in sorted( this.counters.items() ):
+            lines.append( f"{name:36} {n:8}" )
+        return "\n".join( lines )
+
+    # Writes the summary to a file (or stderr)
+    def dump( this, path = None ):
+        if( not this.stats and not this.counters ):
+            return
+        if( path ):
+            with open( path, "w" ) as f:
+                f.write( this.summary() + "\n" )
+        else:
+            print( this.summary(), file = sys.stderr )
+
+class Span:
+    __slots__ = ( "profiler", "name", "start" )
+
+    def __init__( this, profiler, name ):
+        this.profiler = profiler
+        this.name = name
+
+    def __enter__( this ):
+        this.start = time.perf_counter()
+
+    def __exit__( this, *exc ):
+        this.profiler.record( this.name, time.perf_counter() - this.start )
+
+NULL_SPAN = contextlib.nullcontext()
+
+PROFILER = Profiler( enabled = os.environ.get( "HISTOGRAM_PROFILE" ) == "1" )
+
+# Decorator timing every call of a callback under name (when the profiler is enabled)
+def timed( name ):
+    def decorate( fn ):
+        @functools.wraps( fn )
+        def wrapper( *args, **kwargs ):
+            if( not PROFILER.enabled ):
+                return fn( *args, **kwargs )
+            start = time.perf_counter()
+            try:
+                return fn( *args, **kwargs )
+            finally:
+                PROFILER.record( name, time.perf_counter() - start )
+        return wrapper
+    return decorate
@@ -0,0 +1,15 @@
+# Geometry of the Histogram canvas, shared by the GUI (histogram.py) and the
+# offscreen export (export.py) so that both place the bins on the same pixels.
+# No tkinter here: export imports this without a display
+
+# Default canvas size (px, square) and the margins around the frame and the plot
+# area, as fractions of the canvas width and height
+CANVAS_SIZE = 500
+FRAME_MARGIN = 0.1
+PLOT_MARGIN = 0.15
+
+# Plot area of a width x height canvas: left and top margins, then width and height (px)
+def plot_area( width = CANVAS_SIZE, height = CANVAS_SIZE ):
+    left = width * PLOT_MARGIN
+    top = height * PLOT_MARGIN
+    return left, top, width - 2 * left, height - 2 * top
@@ -0,0 +1,43 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Array based engine for the cubic regression splines used by the Estimator.
+# The curve is a least squares fit over the truncated power basis
+#
+#   1, x, x^2, x^3, ( x - k_1 )_+ ^ 3, ..., ( x - k_kn )_+ ^ 3
+#
+# with kn knots evenly spaced inside [ xmin, xmax ]. The design matrix only
+# depends on the x positions and kn, so its pseudo-inverse is computed once
+# per ( x grid, kn ) and every new set of y values is a single product.
+
+# Knot positions: kn knots splitting [ xmin, xmax ] in kn + 1 equal steps
+def knots( xmin, xmax, kn ):
+    step = ( xmax - xmin ) / ( kn + 1 )
+    return xmin + step * np.arange( 1, kn + 1 )
+
+# Truncated power basis evaluated at x ( len( x ) x ( 4 + len( k ) ) )
+def basis( x, k ):
+    x = np.asarray( x, dtype = float )[ :, None ]
+    powers = x ** np.arange( 4 )
+    shifted = x - np.asarray( k, dtype = float )
+    truncated = np.where( shifted >= 0, shifted ** 3, 0.0 )
+    return np.hstack( ( powers, truncated ) )
+
+# Minimum norm least squares solver for the design matrix of a given x grid.
+# Returns the knots and the pseudo-inverse. Singular values below eps * largest
+# are dropped, the same cutoff LAPACK's gelsd uses by default, so rank deficient
+# grids (more knots than bins, as with the default 10 bins and kn = 10) give the
+# same curve as before
+@lru_cache( maxsize = 32 )
+def solver( x, kn ):
+    k = knots( min( x ), max( x ), kn )
+    u, s, vt = np.linalg.svd( basis( x, k ), full_matrices = False )
+    keep = s > np.finfo( float ).eps * s[ 0 ]
+    return k, ( vt[ keep ].T / s[ keep ] ) @ u[ :, keep ].T
+
+# Basis evaluated on p evenly spaced points between xmin and xmax
+@lru_cache( maxsize = 32 )
+def evaluator( k, xmin, xmax, p ):
+    x = np.linspace( xmin, xmax, p )
+    return x, basis( x, k )
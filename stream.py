@@ -0,0 +1,171 @@
+from collections import deque
+
+import numpy as np
+
+from polarization import sorted_distance_terms
+
+# Polarization over sliding time windows of opinion events. The bin model is the
+# Histogram's one: fixed bin values (sorted ascending) and integer weights. Every
+# event adds one to a bin, and leaves the window once it is older than the window
+# length.
+#
+# Changing the weight of bin k by delta changes the measure by
+#
+#   delta * sum_i pi_i ^ ( 1 + a ) * | y_i - y_k | + ( new - old pi_k ^ ( 1 + a ) ) * sum_j pi_j * | y_k - y_j |
+#
+# and both sums are answered by binary indexed trees (over pi, pi * y, pi ^ ( 1 + a )
+# and pi ^ ( 1 + a ) * y) in O(log bins). The measure itself is kept as a running total.
+# A running total of large increments and decrements keeps their rounding error, which
+# can outgrow the true value once large weights expire. That error is bounded by the
+# size of the terms, sum pi ^ ( 1 + a ) * sum pi (times the value range), not by the
+# measure, which can be near zero for a consensus. So the state is reset exactly when
+# the window empties, and rebuilt from the bin weights (in O(bins)) every
+# REBUILD_FACTOR * bins updates, or when the term size falls below DRIFT_RATIO times
+# its largest value since the last rebuild. Drift rebuilds are at least bins updates
+# apart, so every update costs amortized O(log bins)
+
+REBUILD_FACTOR = 4
+MIN_REBUILD = 1024 # Updates between periodic rebuilds are at least this many
+DRIFT_RATIO = 1e-3
+
+# Binary indexed (Fenwick) tree over n float entries
+class FenwickTree:
+    def __init__( this, n ):
+        this.n = n
+        this.tree = [ 0.0 ] * ( n + 1 )
+
+    # Tree holding the given entries, built in O(n)
+    @staticmethod
+    def build( entries ):
+        t = FenwickTree( len( entries ) )
+        for i, e in enumerate( entries, 1 ):
+            t.tree[ i ] += float( e )
+            parent = i + ( i & -i )
+            if( parent <= t.n ):
+                t.tree[ parent ] += t.tree[ i ]
+        return t
+
+    # Adds delta to entry i
+    def add( this, i, delta ):
+        i += 1
+        while( i <= this.n ):
+            this.tree[ i ] += delta
+            i += i & -i
+
+    # Sum of entries [ 0, i )
+    def prefix( this, i ):
+        s = 0.0
+        while( i > 0 ):
+            s += this.tree[ i ]
+            i -= i & -i
+        return s
+
+# Statistics of a histogram whose bins are updated one at a time, in O(log bins) per update
+class WindowStats:
+    def __init__( this, values, K = 1, a = 1.6 ):
+        this.values = [ float( v ) for v in values ]
+        if( any( this.values[ i ] > this.values[ i + 1 ] for i in range( len( this.values ) - 1 ) ) ):
+            raise ValueError( "bin values must be sorted in ascending order" )
+        this.K = K
+        this.a = a
+        n = len( this.values )
+        this.weights = [ 0 ] * n
+        this.rebuild_every = max( REBUILD_FACTOR * n, MIN_REBUILD )
+        this.drift_gap = max( n, 1 ) # Updates between drift rebuilds are at least this many
+        this.rebuild()
+
+    # Recomputes every tree, sum and the measure from the bin weights, in O(bins)
+    def rebuild( this ):
+        y = np.array( this.values )
+        w = np.array( this.weights, dtype = float )
+        f = w ** ( 1 + this.a )
+        this.w = FenwickTree.build( w ) # pi
+        this.wy = FenwickTree.build( w * y ) # pi * y
+        this.f = FenwickTree.build( f ) # pi ^ ( 1 + a )
+        this.fy = FenwickTree.build( f * y ) # pi ^ ( 1 + a ) * y
+        this.total = sum( this.weights ) # sum pi (exact, weights are integers)
+        this.sum_wy = float( w @ y ) # sum pi * y
+        this.sum_wy2 = float( w @ ( y ** 2 ) ) # sum pi * y ^ 2
+        this.sum_f = float( f.sum() ) # sum pi ^ ( 1 + a )
+        this.sum_fy = float( f @ y ) # sum pi ^ ( 1 + a ) * y
+        this.p = float( f @ sorted_distance_terms( y, w ) ) if len( y ) else 0.0 # sum_i sum_j pi_i ^ ( 1 + a ) * pi_j * | y_i - y_j |
+        this.peak = this.scale() # Largest term size since the last rebuild
+        this.updates = 0 # Updates since the last rebuild
+
+    # Size of the terms of the measure, which bounds its rounding error
+    def scale( this ):
+        return this.sum_f * this.total
+
+    # sum_j c_j * | y_k - y_j | for the tree pair ( c, c * y ) with totals ( sum_c, sum_cy )
+    def distance( this, k, c, cy, sum_c, sum_cy ):
+        y = this.values[ k ]
+        below_c = c.prefix( k )
+        below_cy = cy.prefix( k )
+        above_c = sum_c - c.prefix( k + 1 )
+        above_cy = sum_cy - cy.prefix( k + 1 )
+        return ( y * below_c - below_cy ) + ( above_cy - y * above_c )
+
+    # Changes the weight of bin k by delta
+    def add( this, k, delta = 1 ):
+        if( not 0 <= k < len( this.weights ) ):
+            raise IndexError( "bin index out of range" )
+        old = this.weights[ k ]
+        new = old + delta
+        if( new < 0 ):
+            raise ValueError( "bin weights cannot be negative" )
+        y = this.values[ k ]
+        df = new ** ( 1 + this.a ) - old ** ( 1 + this.a )
+
+        # Running measure (the k-th terms of both sums vanish, so the trees can be read before updating)
+        this.p += delta * this.distance( k, this.f, this.fy, this.sum_f, this.sum_fy )
+        this.p += df * this.distance( k, this.w, this.wy, this.total, this.sum_wy )
+
+        this.weights[ k ] = new
+        this.w.add( k, delta )
+        this.wy.add( k, delta * y )
+        this.f.add( k, df )
+        this.fy.add( k, df * y )
+        this.total += delta
+        this.sum_wy += delta * y
+        this.sum_wy2 += delta * y * y
+        this.sum_f += df
+        this.sum_fy += df * y
+
+        # Keep the rounding error of the running totals in check
+        this.updates += 1
+        scale = this.scale()
+        this.peak = max( this.peak, scale )
+        if( this.total == 0 ):
+            this.rebuild() # Empty window: everything is exactly zero again
+        elif( this.updates >= this.rebuild_every ):
+            this.rebuild()
+        elif( this.updates >= this.drift_gap and scale < DRIFT_RATIO * this.peak ):
+            this.rebuild()
+
+    # Mean (undefined, nan, when the window is empty)
+    def mean( this ):
+        return this.sum_wy / this.total if this.total > 0 else float( "nan" )
+
+    # Standard deviation (undefined, nan, when the window is empty)
+    def std( this ):
+        if( this.total <= 0 ):
+            return float( "nan" )
+        m = this.sum_wy / this.total
+        return max( this.sum_wy2 / this.total - m * m, 0.0 ) ** ( 1 / 2 )
+
+    # Polarization measure
+    def pm( this ):
+        return this.K * this.p
+
+# Rolling window statistics over a stream of ( time, bin ) events, in time order. An
+# event belongs to the windows ( t - window, t ] for t between its time and its time
+# plus the window length. Yields ( time, mean, std, pm ) after every event
+def rolling( events, values, window, K = 1, a = 1.6 ):
+    stats = WindowStats( values, K, a )
+    active = deque()
+    for t, k in events:
+        while( active and active[ 0 ][ 0 ] <= t - window ): # Expire events that left the window
+            stats.add( active.popleft()[ 1 ], -1 )
+        stats.add( k, 1 )
+        active.append( ( t, k ) )
+        yield t, stats.mean(), stats.std(), stats.pm()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import bootstrap
+from axioms import bin_values
+
+# Bootstrap intervals depend on the seed only, not on the number of workers
+
+VALUES = bin_values( 10 )
+COUNTS = [ 10, 0, 0, 0, 5, 0, 0, 0, 5, 0 ]
+
+def test_workers_do_not_change_intervals( monkeypatch ):
+    monkeypatch.setattr( bootstrap, "BATCH_SIZE", 500 ) # Several batches for the pool
+    serial = bootstrap.bootstrap( VALUES, COUNTS, replicates = 2100, seed = 14, workers = 1 )
+    parallel = bootstrap.bootstrap( VALUES, COUNTS, replicates = 2100, seed = 14, workers = 2 )
+    assert serial == parallel
+
+def test_intervals_are_ordered():
+    for estimate, low, high in bootstrap.bootstrap( VALUES, COUNTS, replicates = 500, seed = 15 ).values():
+        assert low <= high
+        assert np.isfinite( estimate )
+
+@pytest.mark.parametrize( "replicates", [ 0, -1 ] )
+def test_rejects_no_replicates( replicates ):
+    with pytest.raises( ValueError ):
+        bootstrap.bootstrap( VALUES, COUNTS, replicates = replicates )
+
+@pytest.mark.parametrize( "counts", [
+    [ 0.3, 0.7 ], # Relative frequencies
+    [ 1.5, 2.5 ],
+    [ 1, -1 ],
+    [ 0, 0 ],
+] )
+def test_rejects_invalid_counts( counts ):
+    with pytest.raises( ValueError ):
+        bootstrap.bootstrap( [ 0.25, 0.75 ], counts, replicates = 10 )
+
+def test_accepts_integral_floats():
+    ints = bootstrap.bootstrap( VALUES, COUNTS, replicates = 200, seed = 16 )
+    floats = bootstrap.bootstrap( VALUES, np.asarray( COUNTS, dtype = float ), replicates = 200, seed = 16 )
+    assert ints == floats
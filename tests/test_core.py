@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from core import WeightedStats, batch_stats, measures
+
+# The fused kernel must match the WeightedStats definitions (and the notebooks'
+# spread and coverage), with everything but pm undefined for empty histograms
+
+def test_measures_matches_weighted_stats():
+    rng = np.random.default_rng( 4 )
+    values = list( rng.random( 13 ) ) # Unsorted
+    weights = list( rng.integers( 0, 5, 13 ).astype( float ) )
+    weights[ 0 ] = 2.0
+    stats = WeightedStats( values, weights )
+    m = measures( values, weights, 2, 0.9 )
+    assert m.mean == pytest.approx( stats.mean() )
+    assert m.std == pytest.approx( stats.std() )
+    assert m.var == pytest.approx( stats.std() ** 2 )
+    assert m.pm == pytest.approx( stats.pm( 2, 0.9, method = "quadratic" ) )
+    filled = [ v for v, w in zip( values, weights ) if w > 0 ]
+    assert m.spread == pytest.approx( max( filled ) - min( filled ) )
+    assert m.coverage == weights.count( 0.0 )
+
+def test_measures_undefined_when_empty():
+    m = measures( [ 0.25, 0.75 ], [ 0, 0 ] )
+    assert np.isnan( [ m.mean, m.std, m.var, m.spread, m.coverage ] ).all()
+    assert m.pm == 0
+
+def test_gen_stats_vector():
+    stats = WeightedStats( [ 0.05, 0.15, 0.25 ], [ 1, 0, 3 ] )
+    stats.gen_stats_vector()
+    assert stats.stats_vector == pytest.approx( [ stats.mean(), stats.std(), stats.pm( method = "quadratic" ) ] )
+
+def test_batch_stats_chunks():
+    rng = np.random.default_rng( 5 )
+    values = rng.random( 9 )
+    weights = rng.integers( 0, 4, ( 40, 9 ) ).astype( float )
+    weights[ 7 ] = 0
+    means, stds, pms = batch_stats( values, weights, chunk_size = 6 )
+    assert means.shape == stds.shape == pms.shape == ( 40, )
+    assert np.isnan( means[ 7 ] ) and np.isnan( stds[ 7 ] ) and pms[ 7 ] == 0
+    for h in ( 0, 20, 39 ):
+        m = measures( values, weights[ h ] )
+        assert ( means[ h ], stds[ h ], pms[ h ] ) == pytest.approx( ( m.mean, m.std, m.pm ) )
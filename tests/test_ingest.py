@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from ingest import binned, frequencies, load
+
+# Chunked ingestion (chunks much smaller than the data) must match the in-memory
+# np.unique and np.histogram, through both kinds of files load opens
+
+@pytest.fixture( params = [ "npy", "raw" ] )
+def column( request, tmp_path ):
+    def write( data ):
+        if( request.param == "npy" ):
+            path = tmp_path / "column.npy"
+            np.save( path, data )
+            return load( path )
+        path = tmp_path / "column.bin"
+        data.tofile( path )
+        return load( path, dtype = data.dtype )
+    return write
+
+def test_frequencies( column ):
+    rng = np.random.default_rng( 10 )
+    data = rng.integers( 1, 8, 10001 ).astype( float )
+    values, counts = frequencies( column( data ), chunk_size = 997 )
+    expected_values, expected_counts = np.unique( data, return_counts = True )
+    np.testing.assert_array_equal( values, expected_values )
+    np.testing.assert_array_equal( counts, expected_counts )
+
+def test_frequencies_integer_column( column ):
+    data = np.random.default_rng( 11 ).integers( -3, 3, 5000, dtype = np.int32 )
+    values, counts = frequencies( column( data ), chunk_size = 64 )
+    expected_values, expected_counts = np.unique( data, return_counts = True )
+    np.testing.assert_array_equal( values, expected_values )
+    np.testing.assert_array_equal( counts, expected_counts )
+
+def test_frequencies_rejects_continuous( column ):
+    data = np.random.default_rng( 12 ).random( 5000 )
+    with pytest.raises( ValueError ):
+        frequencies( column( data ), chunk_size = 100, max_distinct = 1000 )
+
+def test_binned( column ):
+    rng = np.random.default_rng( 13 )
+    data = rng.normal( 0.5, 0.3, 10001 )
+    data[ : 3 ] = [ 0, 1, 0.5 ] # Values on the edges, the last one included
+    edges = np.linspace( 0, 1, 11 )
+    centers, counts = binned( column( data ), edges, chunk_size = 997 )
+    expected, _ = np.histogram( data, edges )
+    np.testing.assert_array_equal( counts, expected )
+    np.testing.assert_allclose( centers, ( edges[ : -1 ] + edges[ 1 : ] ) / 2 )
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from kde import KDE, bandwidth
+
+# Binned FFT densities must match the exact weighted kernel sum
+
+def exact( grid, values, weights, bw ):
+    z = ( grid[ :, None ] - values ) / bw
+    return ( weights * np.exp( -0.5 * z ** 2 ) ).sum( axis = 1 ) / ( bw * np.sqrt( 2 * np.pi ) * weights.sum() )
+
+@pytest.mark.parametrize( "seed", range( 5 ) )
+@pytest.mark.parametrize( "m, tol", [ ( 200, 1e-3 ), ( 2001, 1e-5 ) ] )
+def test_density_matches_kernel_sum( seed, m, tol ):
+    rng = np.random.default_rng( seed )
+    values = np.sort( rng.random( 15 ) )
+    weights = rng.integers( 0, 20, 15 ).astype( float )
+    kde = KDE( values, weights )
+    bw = bandwidth( values, weights )
+    grid, density = kde.density( grid = kde.grid( bw, m = m ) )
+    expected = exact( grid, values, weights, bw )
+    assert np.max( np.abs( density - expected ) ) <= tol * expected.max()
+
+def test_bandwidth_adjust():
+    values = np.linspace( 0.05, 0.95, 10 )
+    weights = np.array( [ 10, 0, 0, 0, 5, 0, 0, 0, 5, 0 ] )
+    assert bandwidth( values, weights, 2 ) == pytest.approx( 2 * bandwidth( values, weights ) )
+
+@pytest.mark.parametrize( "weights, nobs", [
+    ( [ 0, 7, 0 ], None ), # One non-empty bin
+    ( [ 0, 0, 0 ], None ), # No weight
+    ( [ 1, 2, 3 ], 1 ), # Single observation
+] )
+def test_undefined_bandwidth( weights, nobs ):
+    with pytest.raises( ValueError ):
+        KDE( [ 0.2, 0.5, 0.8 ], weights, nobs ).density()
+
+def test_caches_are_bounded():
+    kde = KDE( [ 0.2, 0.5, 0.8 ], [ 1, 2, 3 ] )
+    for i in range( 100 ):
+        kde.density( 1 + i / 100 )
+    assert len( kde.densities ) <= kde.densities.size
+    assert len( kde.binned ) <= kde.binned.size
+    # The most recent density is served from the cache
+    assert kde.density( 1.99 )[ 1 ] is kde.density( 1.99 )[ 1 ]
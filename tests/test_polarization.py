@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import polarization
+from polarization import IncrementalStats, pm_quadratic, pm_sorted, pm_sweep
+
+# The sorted prefix sums engine must give the same numbers as the reference double loop
+
+@pytest.mark.parametrize( "n", [ 0, 1, 2, 10, 57 ] )
+@pytest.mark.parametrize( "K, a", [ ( 1, 1.6 ), ( 2.5, 0.3 ), ( 0.5, 1.0 ) ] )
+def test_pm_sorted_matches_quadratic( n, K, a ):
+    rng = np.random.default_rng( n )
+    values = rng.random( n ) * 10 # Unsorted
+    weights = rng.integers( 0, 10, n )
+    assert pm_sorted( values, weights, K, a ) == pytest.approx( pm_quadratic( list( values ), list( weights ), K, a ) )
+
+def test_pm_sorted_with_ties():
+    rng = np.random.default_rng( 1 )
+    values = rng.choice( [ 0.5, 1.5, 4.0 ], size = 30 )
+    weights = rng.random( 30 ) * 5
+    assert pm_sorted( values, weights, 3, 0.8 ) == pytest.approx( pm_quadratic( list( values ), list( weights ), 3, 0.8 ) )
+
+def test_pm_sorted_histogram_values():
+    values = [ 1.0 / 20 + i / 10 for i in range( 10 ) ]
+    weights = [ 10, 0, 0, 0, 5, 0, 0, 0, 5, 0 ]
+    assert pm_sorted( values, weights ) == pytest.approx( pm_quadratic( values, weights ) )
+
+# Single-bin updates of the cached state must agree with a fresh recompute
+
+def test_incremental_stats_matches_recompute():
+    rng = np.random.default_rng( 2 )
+    values = np.arange( 20 ) / 20 + 0.025
+    weights = rng.integers( 0, 10, 20 ).astype( float )
+    stats = IncrementalStats( values, weights, K = 2, a = 0.7 )
+    for _ in range( 1000 ):
+        i = rng.integers( 20 )
+        weights[ i ] = rng.integers( 0, 10 )
+        stats.set_weight( i, weights[ i ] )
+    fresh = IncrementalStats( values, weights, K = 2, a = 0.7 )
+    assert stats.total == fresh.total
+    assert stats.mean() == pytest.approx( fresh.mean() )
+    assert stats.std() == pytest.approx( fresh.std() )
+    assert stats.pm() == pytest.approx( pm_quadratic( list( values ), list( weights ), 2, 0.7 ) )
+
+def test_incremental_stats_reset():
+    values = [ 0.25, 0.75 ]
+    stats = IncrementalStats( values, [ 1, 1 ] )
+    stats.reset( [ 3, 0 ] )
+    assert stats.mean() == pytest.approx( 0.25 )
+    assert stats.std() == pytest.approx( 0.0 )
+    assert stats.pm() == pytest.approx( 0.0 )
+
+# Alpha / K sweeps, with the default (bounded) chunk size forced below the number of histograms
+
+def test_pm_sweep_matches_quadratic( monkeypatch ):
+    monkeypatch.setattr( polarization, "SWEEP_ELEMENTS", 100 )
+    rng = np.random.default_rng( 3 )
+    values = rng.random( 12 )
+    weights = rng.integers( 0, 9, ( 30, 12 ) )
+    alphas = np.linspace( 0.05, 1.6, 8 )
+    sweep = pm_sweep( values, weights, alphas, K = [ 1, 2.5 ] )
+    assert sweep.shape == ( 30, 8, 2 )
+    for h in ( 0, 17, 29 ):
+        for i, a in enumerate( alphas ):
+            assert sweep[ h, i, 1 ] == pytest.approx( pm_quadratic( list( values ), list( weights[ h ] ), 2.5, a ) )
+    assert pm_sweep( values, weights[ 0 ], alphas ).shape == ( 8, )
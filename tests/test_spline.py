@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import spline
+from core import Estimator
+
+# The Estimator curve is the least squares cubic spline of the bin positions. On
+# full rank grids it must match np.linalg.lstsq on a rescaled (well conditioned)
+# basis, which spans the same functions. With more coefficients than bins (the
+# default 10 bins and kn = 10) the minimum norm solution in pixel units is used
+
+# Bin centers and heights (px) as the Histogram places them on its canvas
+def bins_px( bins, seed ):
+    rng = np.random.default_rng( seed )
+    x = 75 + ( np.arange( bins ) + 0.5 ) * 350 / bins
+    return x, rng.uniform( 75, 425, bins )
+
+def curve( x, y, kn, p = 100 ):
+    est = Estimator()
+    est.fit( x, y, kn )
+    return est.produce( x[ 0 ], x[ -1 ], p )
+
+@pytest.mark.parametrize( "bins, kn", [ ( 10, 0 ), ( 10, 5 ), ( 50, 10 ), ( 200, 10 ) ] )
+def test_full_rank_matches_lstsq( bins, kn ):
+    x, y = bins_px( bins, bins + kn )
+    lo, hi = x.min(), x.max()
+    scale = lambda v: ( np.asarray( v ) - lo ) / ( hi - lo )
+    k = scale( spline.knots( lo, hi, kn ) )
+    coef = np.linalg.lstsq( spline.basis( scale( x ), k ), y, rcond = None )[ 0 ]
+    xy = curve( x, y, kn )
+    np.testing.assert_allclose( xy[ 0 :: 2 ], np.linspace( lo, hi, 100 ) )
+    np.testing.assert_allclose( xy[ 1 :: 2 ], spline.basis( scale( xy[ 0 :: 2 ] ), k ) @ coef, atol = 1e-6 )
+
+def test_rank_deficient_default():
+    x, y = bins_px( 10, 0 )
+    k = spline.knots( x.min(), x.max(), 10 )
+    A = spline.basis( x, k )
+    coef = np.linalg.lstsq( A, y, rcond = None )[ 0 ]
+    est = Estimator()
+    est.fit( x, y, 10 )
+    np.testing.assert_allclose( A @ est.q, y, atol = 1e-6 ) # Interpolates the bins
+    xy = est.produce( x[ 0 ], x[ -1 ], 100 )
+    np.testing.assert_allclose( xy[ 1 :: 2 ], spline.basis( xy[ 0 :: 2 ], k ) @ coef, atol = 1e-6 )
+
+def test_fit_is_linear_in_y():
+    x, y = bins_px( 20, 1 )
+    first = curve( x, y, 5 )
+    np.testing.assert_allclose( curve( x, 2 * y, 5 )[ 1 :: 2 ], 2 * first[ 1 :: 2 ], atol = 1e-6 )
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from core import measures
+from stream import WindowStats, rolling
+
+# Rolling window statistics must match a recompute of every window from scratch
+
+def window_weights( times, bins, t, window, n ):
+    inside = ( times > t - window ) & ( times <= t )
+    return np.bincount( bins[ inside ], minlength = n )
+
+def test_rolling_matches_recompute():
+    rng = np.random.default_rng( 6 )
+    values = np.sort( rng.random( 17 ) )
+    times = np.cumsum( rng.exponential( 1, 3000 ) )
+    bins = rng.integers( 0, 17, 3000 )
+    for t, mean, std, pm in rolling( zip( times, bins ), values, 25.0, K = 2, a = 0.8 ):
+        m = measures( values, window_weights( times, bins, t, 25.0, 17 ), 2, 0.8 )
+        assert ( mean, std, pm ) == pytest.approx( ( m.mean, m.std, m.pm ), rel = 1e-9, abs = 1e-9 )
+
+# A burst of heavy windows followed by sparse ones: the running measure must not keep
+# the rounding error of the burst once it expires
+def test_rolling_after_burst():
+    rng = np.random.default_rng( 7 )
+    values = np.linspace( 0.05, 0.95, 10 )
+    times = np.concatenate( ( np.linspace( 0, 1, 100000 ), [ 10.0, 10.5, 11.0 ] ) )
+    bins = np.concatenate( ( rng.integers( 0, 10, 100000 ), [ 0, 4, 9 ] ) )
+    *_, last = rolling( zip( times, bins ), values, 5.0 )
+    m = measures( values, window_weights( times, bins, 11.0, 5.0, 10 ) )
+    assert last[ 3 ] == pytest.approx( m.pm, rel = 1e-9 )
+    assert last[ 1 ] == pytest.approx( m.mean )
+
+# Heavy events leaving while sparse ones stay in the window (it never empties)
+def test_rolling_after_overlapping_burst():
+    rng = np.random.default_rng( 9 )
+    values = np.linspace( 0.05, 0.95, 10 )
+    times = np.concatenate( ( np.linspace( 0, 1, 100000 ), [ 3.0, 5.5, 6.0 ] ) )
+    bins = np.concatenate( ( rng.integers( 0, 10, 100000 ), [ 0, 4, 9 ] ) )
+    *_, last = rolling( zip( times, bins ), values, 5.0 )
+    m = measures( values, window_weights( times, bins, 6.0, 5.0, 10 ) )
+    assert last[ 3 ] == pytest.approx( m.pm, rel = 1e-9 )
+
+# A consensus with an outlier entering and leaving: the measure drops to about zero
+# every time, but the terms do not shrink, so only periodic rebuilds run
+def test_consensus_with_outlier_rebuilds():
+    n = 2000
+    stats = WindowStats( np.linspace( 0, 1, n ) )
+    stats.add( 0, 50 )
+    rebuilds = []
+    rebuild = stats.rebuild
+    stats.rebuild = lambda: ( rebuilds.append( 1 ), rebuild() )
+    for _ in range( 2000 ):
+        stats.add( n - 1, 1 )
+        stats.add( n - 1, -1 )
+    assert len( rebuilds ) <= 4000 // stats.rebuild_every
+    assert stats.pm() == pytest.approx( 0, abs = 1e-9 )
+
+def test_drained_window_is_zero():
+    rng = np.random.default_rng( 8 )
+    stats = WindowStats( np.linspace( 0, 1, 10 ) )
+    bins = rng.integers( 0, 10, 100000 )
+    for k in bins:
+        stats.add( k, 1 )
+    for k in bins:
+        stats.add( k, -1 )
+    assert stats.pm() == 0
+    assert np.isnan( stats.mean() )
+
+@pytest.mark.parametrize( "k", [ -1, 3 ] )
+def test_bin_index_out_of_range( k ):
+    with pytest.raises( IndexError ):
+        WindowStats( [ 0, 1, 2 ] ).add( k, 1 )
+
+def test_unsorted_values():
+    with pytest.raises( ValueError ):
+        WindowStats( [ 2, 1 ] )